@@ -1,13 +1,23 @@
-from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./shopify_insights.db")
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./shopify_insights.db")
 
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# SQLite gets a NullPool or StaticPool from SQLAlchemy, which reject queue-pool sizing
+if make_url(DATABASE_URL).get_backend_name() == "sqlite":
+    pool_options = {}
+else:
+    pool_options = {"pool_size": 20, "max_overflow": 10, "pool_timeout": 30}
+
+engine = create_async_engine(
+    DATABASE_URL,
+    pool_pre_ping=True,
+    **pool_options
+)
+SessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
 Base = declarative_base()
\ No newline at end of file
@@ -1,12 +1,20 @@
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from pydantic_core import to_jsonable_python
 from pydantic_models import StoreAnalysisRequest, BrandInsights
 import asyncio
 import logging
+import orjson
+import time
+from collections import OrderedDict
 from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import AsyncIterator, Optional, Tuple
+from sqlalchemy import select
 
 from database import engine, SessionLocal, Base
-from models import ShopifyStore
+from models import ShopifyStore, migrate_schema
 from services.shopify_scraper import ShopifyScraperService
 from services.llm_processor import LLMProcessorService
 
@@ -14,20 +22,111 @@ from services.llm_processor import LLMProcessorService
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Services keep no per-request state, so one instance is shared by all requests
+# and their HTTP connection pools are reused across analyses.
+scraper_service = ShopifyScraperService()
+
+@lru_cache(maxsize=1)
+def get_llm_service() -> LLMProcessorService:
+    return LLMProcessorService()
+
+# Recently served insights payloads, so hot store URLs skip the database entirely
+_PAYLOAD_CACHE_TTL_SECONDS = 60
+_PAYLOAD_CACHE_MAX_ENTRIES = 1024
+_payload_cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+def _get_cached_payload(store_url: str) -> Optional[str]:
+    entry = _payload_cache.get(store_url)
+    if entry is None:
+        return None
+    expires_at, payload = entry
+    if expires_at <= time.monotonic():
+        del _payload_cache[store_url]
+        return None
+    _payload_cache.move_to_end(store_url)
+    return payload
+
+def _cache_payload(store_url: str, payload: str):
+    _payload_cache[store_url] = (time.monotonic() + _PAYLOAD_CACHE_TTL_SECONDS, payload)
+    _payload_cache.move_to_end(store_url)
+    while len(_payload_cache) > _PAYLOAD_CACHE_MAX_ENTRIES:
+        _payload_cache.popitem(last=False)
+
+def _serialize_insights(insights: BrandInsights) -> str:
+    """Dump insights to the stored JSON text. Runs in a worker thread."""
+    return orjson.dumps(insights.model_dump(mode="json")).decode()
+
+async def _save_insights(db, existing_store: Optional[ShopifyStore], store_url: str, insights: BrandInsights) -> str:
+    """Persist freshly analyzed insights and return the stored JSON payload."""
+    store = existing_store or ShopifyStore(store_url=store_url)
+    # Dumping a large catalog takes long enough to stall other requests, so it
+    # runs off the event loop; the session-attached row is only touched here
+    payload = await asyncio.to_thread(_serialize_insights, insights)
+    store.update_insights(payload, insights.total_products)
+    if not existing_store:
+        db.add(store)
+    
+    await db.commit()
+    
+    _cache_payload(store_url, store.insights_data)
+    return store.insights_data
+
+def _cached_response(payload: str, stream: bool) -> Response:
+    """Serve stored JSON as-is: no validation, no re-encoding."""
+    if stream:
+        line = b'{"phase":"cached","data":' + payload.encode() + b'}\n'
+        return Response(content=line, media_type="application/x-ndjson")
+    return Response(content=payload, media_type="application/json")
+
+def _ndjson_line(phase: str, data) -> bytes:
+    return orjson.dumps({"phase": phase, "data": data}, default=to_jsonable_python) + b"\n"
+
+async def _stream_analysis(store_url: str, insights: BrandInsights,
+                           llm_service: Optional[LLMProcessorService]) -> AsyncIterator[bytes]:
+    """Yield NDJSON phases: the scrape result first, then each LLM enhancement as it finishes.
+    
+    The scrape has already succeeded by the time streaming starts, so its
+    failures keep their HTTP status codes; a failure after that can only be
+    reported in-band, as a final `error` line.
+    """
+    try:
+        yield _ndjson_line("scrape", insights)
+        
+        if llm_service:
+            async for phase, fields in llm_service.iter_enhancements(insights):
+                yield _ndjson_line(phase, fields)
+        
+        # The request's session can be closed before the body is streamed,
+        # so persist with a session of our own
+        async with SessionLocal() as db:
+            result = await db.execute(select(ShopifyStore).where(ShopifyStore.store_url == store_url))
+            await _save_insights(db, result.scalars().first(), store_url, insights)
+        
+        logger.info(f"Analysis completed for {store_url}")
+        
+    except Exception as e:
+        logger.error(f"Error analyzing store {store_url}: {str(e)}")
+        yield _ndjson_line("error", {"detail": str(e)})
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    Base.metadata.create_all(bind=engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(migrate_schema)
     logger.info("Database tables created")
     yield
     # Shutdown
+    await scraper_service.close()
+    await engine.dispose()
     logger.info("Application shutting down")
 
 app = FastAPI(
     title="Shopify Store Insights Fetcher",
     description="Extract comprehensive insights from Shopify stores",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 app.add_middleware(
@@ -39,14 +138,9 @@ app.add_middleware(
 )
 
 # Dependency
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
-
-
 
 @app.post("/analyze-store", response_model=BrandInsights)
 async def analyze_shopify_store(
@@ -57,34 +151,39 @@ async def analyze_shopify_store(
     Analyze a Shopify store and extract comprehensive insights.
     """
     try:
-        store_url = str(request.website_url)
+        store_url = request.website_url
         logger.info(f"Starting analysis for store: {store_url}")
         
-        # Initialize services
-        scraper_service = ShopifyScraperService()
-        llm_service = LLMProcessorService() if request.use_llm else None
+        llm_service = get_llm_service() if request.use_llm else None
+        
+        cached_payload = _get_cached_payload(store_url)
+        if cached_payload is not None:
+            logger.info(f"Returning in-memory cached data for {store_url}")
+            return _cached_response(cached_payload, request.stream)
         
         # Check if we have recent data in database
-        existing_store = db.query(ShopifyStore).filter(ShopifyStore.store_url == store_url).first()
+        result = await db.execute(select(ShopifyStore).where(ShopifyStore.store_url == store_url))
+        existing_store = result.scalars().first()
         
         if existing_store and existing_store.is_recent():
             logger.info(f"Returning cached data for {store_url}")
-            return BrandInsights.parse_raw(existing_store.insights_data)
+            _cache_payload(store_url, existing_store.insights_data)
+            return _cached_response(existing_store.insights_data, request.stream)
+        
+        if request.stream:
+            # Scrape before the response starts so scrape failures map to status codes below
+            insights = await scraper_service.analyze_store(store_url)
+            return StreamingResponse(_stream_analysis(store_url, insights, llm_service), media_type="application/x-ndjson")
         
         # Scrape the store
         insights = await scraper_service.analyze_store(store_url, llm_service)
         
         # Save to database
-        if existing_store:
-            existing_store.update_insights(insights.dict())
-        else:
-            new_store = ShopifyStore(store_url=store_url, insights_data=insights.json())
-            db.add(new_store)
-        
-        db.commit()
+        payload = await _save_insights(db, existing_store, store_url, insights)
         
         logger.info(f"Analysis completed for {store_url}")
-        return insights
+        # The persisted payload doubles as the response body
+        return Response(content=payload, media_type="application/json")
         
     except Exception as e:
         logger.error(f"Error analyzing store {store_url}: {str(e)}")
@@ -101,26 +200,32 @@ async def get_analyzed_stores(db = Depends(get_db)):
     """
     Get list of previously analyzed stores.
     """
-    stores = db.query(ShopifyStore).order_by(ShopifyStore.updated_at.desc()).limit(50).all()
+    # Only the listed columns are loaded, so the insights payload is never
+    # transferred or decoded for the listing
+    result = await db.execute(
+        select(ShopifyStore.store_url, ShopifyStore.updated_at, ShopifyStore.total_products)
+        .order_by(ShopifyStore.updated_at.desc())
+        .limit(50)
+    )
     return [
         {
-            "store_url": store.store_url,
-            "last_analyzed": store.updated_at,
-            "total_products": store.get_total_products()
+            "store_url": store_url,
+            "last_analyzed": updated_at,
+            "total_products": products or 0
         }
-        for store in stores
+        for store_url, updated_at, products in result.all()
     ]
 
-@app.get("/store/{store_id}")
+@app.get("/store/{store_id}", response_model=BrandInsights)
 async def get_store_insights(store_id: int, db = Depends(get_db)):
     """
     Get insights for a specific store by ID.
     """
-    store = db.query(ShopifyStore).filter(ShopifyStore.id == store_id).first()
+    store = await db.get(ShopifyStore, store_id)
     if not store:
         raise HTTPException(status_code=404, detail="Store not found")
     
-    return BrandInsights.parse_raw(store.insights_data)
+    return Response(content=store.insights_data, media_type="application/json")
 
 @app.get("/health")
 async def health_check():
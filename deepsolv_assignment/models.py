@@ -1,9 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, cast, inspect, text, update
 from sqlalchemy.dialects.mysql import MEDIUMTEXT
 from sqlalchemy.sql import func
 from database import Base
 from datetime import datetime, timedelta
-import json
 
 class ShopifyStore(Base):
     __tablename__ = "shopify_stores"
@@ -11,7 +10,8 @@ class ShopifyStore(Base):
     id = Column(Integer, primary_key=True, index=True)
     store_url = Column(String(500), unique=True, index=True, nullable=False)
     store_name = Column(String(200))
-    insights_data = Column(MEDIUMTEXT, nullable=False)  
+    insights_data = Column(Text().with_variant(MEDIUMTEXT, "mysql"), nullable=False)  
+    total_products = Column(Integer, default=0, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), server_default=func.now())
     is_active = Column(Boolean, default=True)
@@ -22,16 +22,34 @@ class ShopifyStore(Base):
             return False
         return datetime.utcnow() - self.updated_at < timedelta(hours=hours)
     
-    def update_insights(self, insights_dict):
-        """Update insights data."""
-        self.insights_data = json.dumps(insights_dict)
+    def update_insights(self, insights_json, total_products=0):
+        """Update insights data from its serialized JSON."""
+        self.insights_data = insights_json
+        self.total_products = total_products
         self.updated_at = datetime.utcnow()
     
     def get_total_products(self):
-        """Get total products from insights data."""
-        try:
-            data = json.loads(self.insights_data)
-            return data.get('total_products', 0)
-        except:
-            return 0
+        """Get total products, stored alongside the insights data."""
+        return self.total_products or 0
+
+def migrate_schema(connection):
+    """Bring a shopify_stores table created by an older version up to date.
+    
+    Adds the total_products column and its index, and backfills it from the
+    stored insights. Runs at startup through `run_sync`, after `create_all`.
+    """
+    table = ShopifyStore.__table__
+    columns = {column['name'] for column in inspect(connection).get_columns(table.name)}
+    if 'total_products' in columns:
+        return
+    
+    connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN total_products INTEGER DEFAULT 0"))
+    for index in table.indexes:
+        if 'total_products' in index.columns:
+            index.create(connection)
+    connection.execute(
+        update(table).values(
+            total_products=func.coalesce(cast(func.json_extract(table.c.insights_data, '$.total_products'), Integer), 0)
+        )
+    )
         
\ No newline at end of file
@@ -1,9 +1,12 @@
-from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, HttpUrl, validator
+from typing import List, Optional
+from urllib.parse import quote, urlsplit, urlunsplit
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
 
 class ProductInfo(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     id: int
     title: str
     handle: str
@@ -15,9 +18,12 @@ class ProductInfo(BaseModel):
     tags: List[str] = []
     images: List[str] = []
     description: Optional[str] = None
-    variants: List[Dict[str, Any]] = []
+    # Stored as scraped; typed loosely so pydantic doesn't validate every variant dict
+    variants: list = Field(default_factory=list)
 
 class SocialHandle(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     platform: str
     url: str
     handle: Optional[str] = None
@@ -28,10 +34,14 @@ class ContactInfo(BaseModel):
     address: Optional[str] = None
 
 class FAQ(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     question: str
     answer: str
 
 class ImportantLink(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore")
+    
     name: str
     url: str
     description: Optional[str] = None
@@ -53,15 +63,65 @@ class BrandInsights(BaseModel):
     payment_methods: List[str] = []
     shipping_info: Optional[str] = None
 
+# Characters left as-is when percent-encoding each URL part, following the
+# WHATWG URL encode sets that HttpUrl applied
+_PATH_SAFE = "!$%&'()*+,-./:;=@[]\\^_|~"
+_QUERY_SAFE = "!$%&()*+,-./:;=?@[]\\^_`{|}~"
+_FRAGMENT_SAFE = "!#$%&'()*+,-./:;=?@[]\\^_{|}~"
+
+_SINGLE_DOT_SEGMENTS = frozenset({'.', '%2e'})
+_DOUBLE_DOT_SEGMENTS = frozenset({'..', '.%2e', '%2e.', '%2e%2e'})
+
+def _remove_dot_segments(path: str) -> str:
+    """Resolve '.' and '..' segments (including percent-encoded dots) of an absolute path."""
+    segments = path.split('/')[1:]
+    resolved = []
+    for i, segment in enumerate(segments):
+        is_last = i == len(segments) - 1
+        if segment.lower() in _DOUBLE_DOT_SEGMENTS:
+            if resolved:
+                resolved.pop()
+        elif segment.lower() not in _SINGLE_DOT_SEGMENTS:
+            resolved.append(segment)
+            continue
+        # A trailing dot segment still leaves the path ending in '/'
+        if is_last:
+            resolved.append('')
+    return '/' + '/'.join(resolved)
+
 class StoreAnalysisRequest(BaseModel):
-    website_url: HttpUrl
+    website_url: str
     use_llm: bool = False
+    # Return NDJSON phases as they complete instead of one JSON document
+    stream: bool = False
     
-    @validator('website_url')
-    def validate_shopify_url(cls, v):
-        url_str = str(v)
-        # Check if it's likely a Shopify store
-        if not any(indicator in url_str.lower() for indicator in ['shopify', '.myshopify.com']):
-            # We'll still process it as it might be a custom domain
-            pass
-        return v
\ No newline at end of file
+    @field_validator('website_url')
+    @classmethod
+    def validate_website_url(cls, v: str) -> str:
+        # Normalized the way HttpUrl used to, since stored rows are keyed on that
+        # form: backslashes read as '/', lowercase IDNA-encoded host, no default
+        # port, dot segments resolved, '/' for a bare host, unsafe characters
+        # percent-encoded. Rare IDNA 2008-only hosts may still differ.
+        v = v.strip()
+        cut = min((i for i in (v.find('?'), v.find('#')) if i >= 0), default=len(v))
+        v = v[:cut].replace('\\', '/') + v[cut:]
+        try:
+            parts = urlsplit(v)
+            port = parts.port
+            host = parts.hostname.encode('idna').decode('ascii') if parts.hostname else ''
+        except (ValueError, UnicodeError):
+            raise ValueError('website_url must be a valid URL')
+        scheme = parts.scheme.lower()
+        if scheme not in ('http', 'https') or not host:
+            raise ValueError('website_url must start with http:// or https://')
+        
+        netloc = f"[{host}]" if ':' in host else host
+        if port is not None and port != (443 if scheme == 'https' else 80):
+            netloc = f"{netloc}:{port}"
+        if parts.username is not None:
+            userinfo = parts.username if parts.password is None else f"{parts.username}:{parts.password}"
+            netloc = f"{userinfo}@{netloc}"
+        path = quote(_remove_dot_segments(parts.path or '/'), safe=_PATH_SAFE)
+        query = quote(parts.query, safe=_QUERY_SAFE)
+        fragment = quote(parts.fragment, safe=_FRAGMENT_SAFE)
+        return urlunsplit((scheme, netloc, path, query, fragment))
\ No newline at end of file
@@ -0,0 +1,92 @@
+from langchain_google_genai import GoogleGenerativeAIEmbeddings
+from collections import OrderedDict
+from functools import lru_cache
+from operator import mul
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+import hashlib
+import logging
+import math
+import time
+
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=1)
+def _get_embedder() -> GoogleGenerativeAIEmbeddings:
+    return GoogleGenerativeAIEmbeddings(model="models/text-embedding-004")
+
+class SemanticCache:
+    """Process-local cache of parsed LLM responses keyed on prompt similarity.
+
+    Lookups first try an exact key (a caller-supplied key, or a hash of the
+    prompt). When the caller also passes `similar_text`, that text is embedded
+    and compared against text cached under the same `scope`, so near-duplicate
+    inputs reuse an earlier response without crossing into another scope.
+    """
+
+    def __init__(self, threshold: float = 0.95, ttl_seconds: int = 6 * 3600, max_entries: int = 256):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # key -> (expires_at, scope, normalized embedding, parsed response)
+        self._entries: "OrderedDict[str, Tuple[float, Optional[str], Optional[List[float]], Any]]" = OrderedDict()
+
+    async def get_or_call(self, prompt: str, call: Callable[[], Awaitable[str]], key: Optional[str] = None,
+                          parse: Optional[Callable[[str], Any]] = None, similar_text: Optional[str] = None,
+                          scope: Optional[str] = None) -> Any:
+        """Return a cached result for the prompt, or await `call`, parse its reply and cache it.
+
+        `parse` runs before anything is cached; if it raises, the exception
+        propagates and the reply is not cached, so a malformed reply is retried
+        on the next call instead of being served again.
+        """
+        self._evict_expired()
+        exact_key = key or hashlib.sha256(prompt.encode()).hexdigest()
+
+        entry = self._entries.get(exact_key)
+        if entry:
+            self._entries.move_to_end(exact_key)
+            logger.info("LLM cache hit (exact)")
+            return entry[3]
+
+        embedding = None
+        if similar_text:
+            embedding = await self._embed(similar_text)
+            if embedding:
+                entry = self._nearest(embedding, scope)
+                if entry is not None:
+                    logger.info("LLM cache hit (semantic)")
+                    return entry[3]
+
+        content = await call()
+        result = parse(content) if parse else content
+        self._entries[exact_key] = (time.monotonic() + self.ttl_seconds, scope, embedding, result)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return result
+
+    async def _embed(self, text: str) -> Optional[List[float]]:
+        """Embed text and normalize it so cosine similarity is a dot product."""
+        try:
+            vector = await _get_embedder().aembed_query(text)
+            norm = math.sqrt(sum(map(mul, vector, vector)))
+            return [v / norm for v in vector] if norm else None
+        except Exception as e:
+            logger.warning(f"Error embedding prompt for LLM cache: {e}")
+            return None
+
+    def _nearest(self, embedding: List[float], scope: Optional[str]):
+        best_score, best_entry = self.threshold, None
+        for entry in self._entries.values():
+            _, cached_scope, cached_embedding, _ = entry
+            if cached_embedding is None or cached_scope != scope:
+                continue
+            score = sum(map(mul, embedding, cached_embedding))
+            if score >= best_score:
+                best_score, best_entry = score, entry
+        return best_entry
+
+    def _evict_expired(self):
+        now = time.monotonic()
+        expired = [k for k, (expires_at, _, _, _) in self._entries.items() if expires_at <= now]
+        for k in expired:
+            del self._entries[k]
@@ -1,8 +1,14 @@
 from langchain_google_genai import ChatGoogleGenerativeAI
-import json
+from collections import Counter
+from functools import cache
+import asyncio
+import orjson
 import os
-from typing import Optional
-from pydantic_models import BrandInsights
+import statistics
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from pydantic import TypeAdapter
+from pydantic_models import BrandInsights, FAQ
+from services.llm_cache import SemanticCache
 import logging
 from dotenv import load_dotenv
 
@@ -10,76 +16,256 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+_LLM_ENABLED = bool(os.getenv('GOOGLE_API_KEY'))
+
+# gemini-2.5-pro always thinks, and thinking tokens count against
+# max_output_tokens, so every output cap reserves this budget on top
+_THINKING_BUDGET = 128
+_MAX_REPLY_TOKENS = 400
+
+@cache
+def _get_client() -> ChatGoogleGenerativeAI:
+    """Build the Gemini client once; the first caller pays for credential discovery."""
+    return ChatGoogleGenerativeAI(
+        model="gemini-2.5-pro",
+        temperature=0.2,
+        max_output_tokens=_MAX_REPLY_TOKENS + _THINKING_BUDGET,
+        thinking_budget=_THINKING_BUDGET,
+        top_p=0.95,
+        top_k=40
+    )
+
+# Shared across service instances so repeated inputs skip the Gemini call
+_BRAND_CONTEXT_CACHE = SemanticCache()
+_FAQ_CACHE = SemanticCache()
+_CATALOG_CACHE = SemanticCache()
+
+_FAQ_LIST_ADAPTER = TypeAdapter(List[FAQ])
+_CATALOG_ADAPTER = TypeAdapter(Dict[str, List[str]])
+
+# Structured-output schemas, so Gemini replies with bare JSON of the expected shape
+_FAQ_LIST_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {
+            "question": {"type": "string"},
+            "answer": {"type": "string"}
+        },
+        "required": ["question", "answer"]
+    }
+}
+_CATALOG_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "payment_methods": {"type": "array", "items": {"type": "string"}},
+        "currencies": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["payment_methods", "currencies"]
+}
+
+# Prompt-size caps; prefill time grows with prompt length
+_MAX_BRAND_CONTEXT_CHARS = 4000
+_MAX_FAQS = 20
+
+# Zero-width characters that page builders leave in scraped text
+_INVISIBLE_CHARS = dict.fromkeys(map(ord, '\u200b\u200c\u200d\u2060\ufeff'))
+
+def _normalize_text_fast(text: str) -> str:
+    """Strip zero-width characters and collapse whitespace runs to single spaces."""
+    return " ".join(text.translate(_INVISIBLE_CHARS).split())
+
+def _summarize_catalog(products: list) -> str:
+    """Condense a catalog into vendor, product-type and price aggregates for prompting."""
+    vendor_top = Counter(p.vendor for p in products if p.vendor).most_common(5)
+    type_top = Counter(p.product_type for p in products if p.product_type).most_common(5)
+    prices = []
+    for p in products:
+        try:
+            prices.append(float(p.price))
+        except (TypeError, ValueError):
+            continue
+    
+    lines = [
+        f"Total products: {len(products)}",
+        "Top vendors: " + (", ".join(f"{name} ({count})" for name, count in vendor_top) or "unknown"),
+        "Top product types: " + (", ".join(f"{name} ({count})" for name, count in type_top) or "unknown")
+    ]
+    if prices:
+        lines.append(f"Prices: min {min(prices):.2f}, median {statistics.median(prices):.2f}, max {max(prices):.2f}")
+    return "\n".join(lines)
+
+def _parse_brand_context(content: str) -> str:
+    brand_context = content.strip()
+    if not brand_context:
+        raise ValueError("Empty brand context reply")
+    return brand_context
+
+def _parse_faqs(content: str) -> List[FAQ]:
+    return _FAQ_LIST_ADAPTER.validate_python(orjson.loads(content))
+
+def _parse_catalog_analysis(content: str) -> dict:
+    return _CATALOG_ADAPTER.validate_python(orjson.loads(content))
+
+class _JsonEndScanner:
+    """Tracks bracket depth across streamed chunks to spot the end of a JSON value."""
+    
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+    
+    def feed(self, text: str) -> Optional[int]:
+        """Return the index just past the closing bracket if it is in `text`."""
+        for i, ch in enumerate(text):
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == '\\':
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = True
+            elif ch in '{[':
+                self.depth += 1
+            elif ch in '}]':
+                self.depth -= 1
+                if self.depth == 0:
+                    return i + 1
+        return None
+
 class LLMProcessorService:
     def __init__(self):
-        self.client = ChatGoogleGenerativeAI(
-            model="gemini-2.5-pro",
-            temperature=0.2,
-            max_output_tokens=400,
-            top_p=0.95,
-            top_k=40
-        )
-        self.enabled = bool(os.getenv('GOOGLE_API_KEY'))  # changed from OPENAI_API_KEY
+        self.enabled = _LLM_ENABLED
+        self.client = _get_client() if self.enabled else None
     
     async def enhance_insights(self, insights: BrandInsights) -> BrandInsights:
         """Use LLM to enhance and structure the scraped data."""
-        if not self.enabled:
-            logger.warning("Google Gemini API key not provided, skipping LLM enhancement")
-            return insights
-        
         try:
-            # Enhance brand context
-            logger.info("Enhancing brand context using LLM")
-            if insights.brand_context:
-                insights.brand_context = await self._enhance_brand_context(insights.brand_context)
-            
-            # Enhance and structure FAQs
-            if insights.faqs:
-                insights.faqs = await self._enhance_faqs(insights.faqs)
-            
-            # Extract additional insights from product catalog
-            if insights.product_catalog:
-                enhanced_data = await self._analyze_product_catalog(insights.product_catalog)
-                insights.payment_methods = enhanced_data.get('payment_methods', [])
-                insights.currencies_accepted = enhanced_data.get('currencies', [])
-            
+            async for _ in self.iter_enhancements(insights):
+                pass
             return insights
             
         except Exception as e:
             logger.error(f"Error in LLM processing: {e}")
             return insights
     
-    async def _enhance_brand_context(self, brand_context: str) -> str:
+    async def iter_enhancements(self, insights: BrandInsights) -> AsyncIterator[Tuple[str, dict]]:
+        """Run the LLM enhancements concurrently, yielding (phase, updated fields) as each finishes.
+        
+        The updated fields are applied to `insights` before they are yielded. The
+        enhancements touch independent fields, so a failure in one keeps the
+        scraped value for that field only.
+        """
+        if not self.enabled:
+            logger.warning("Google Gemini API key not provided, skipping LLM enhancement")
+            return
+        
+        phases = []
+        if insights.brand_context:
+            phases.append(self._brand_context_phase(insights.store_url, insights.brand_context))
+        if insights.faqs:
+            phases.append(self._faqs_phase(insights.store_url, insights.faqs))
+        if insights.product_catalog:
+            phases.append(self._catalog_phase(insights.product_catalog))
+        
+        for next_done in asyncio.as_completed(phases):
+            try:
+                phase, fields = await next_done
+            except Exception as e:
+                logger.error(f"Error in LLM enhancement: {e}")
+                continue
+            
+            for name, value in fields.items():
+                setattr(insights, name, value)
+            yield phase, fields
+    
+    async def _brand_context_phase(self, store_url: str, brand_context: str) -> Tuple[str, dict]:
+        return 'brand_context', {'brand_context': await self._enhance_brand_context(brand_context, store_url)}
+    
+    async def _faqs_phase(self, store_url: str, faqs: list) -> Tuple[str, dict]:
+        return 'faqs', {'faqs': await self._enhance_faqs(faqs, store_url)}
+    
+    async def _catalog_phase(self, products: list) -> Tuple[str, dict]:
+        # Extract additional insights from product catalog
+        enhanced_data = await self._analyze_product_catalog(products)
+        return 'catalog_analysis', {
+            'payment_methods': enhanced_data.get('payment_methods', []),
+            'currencies_accepted': enhanced_data.get('currencies', [])
+        }
+    
+    async def _invoke(self, system_prompt: str, prompt: str, max_output_tokens: Optional[int] = None,
+                      response_schema: Optional[dict] = None) -> str:
+        """Send a single system/user exchange to Gemini and return the reply text.
+        
+        With a response schema the reply is requested as JSON, streamed, and the
+        stream is dropped as soon as the top-level JSON value is complete. A
+        stream that ends before the value closes raises ValueError.
+        
+        `max_output_tokens` caps the reply itself; the thinking budget is added on top.
+        """
+        messages = [("system", system_prompt), ("user", prompt)]
+        generation_config = {}
+        if max_output_tokens:
+            generation_config["max_output_tokens"] = max_output_tokens + _THINKING_BUDGET
+        
+        if response_schema is None:
+            response = await self.client.ainvoke(messages, generation_config=generation_config or None)
+            return response.content
+        
+        scanner = _JsonEndScanner()
+        reply = []
+        async for chunk in self.client.astream(
+            messages,
+            generation_config=generation_config,
+            response_mime_type="application/json",
+            response_schema=response_schema
+        ):
+            end = scanner.feed(chunk.content)
+            if end is not None:
+                reply.append(chunk.content[:end])
+                return "".join(reply)
+            reply.append(chunk.content)
+        raise ValueError("LLM reply ended before its JSON value was complete")
+    
+    async def _enhance_brand_context(self, brand_context: str, store_url: Optional[str] = None) -> str:
         """Enhance brand context using LLM."""
         try:
             logger.info("Enhancing brand context using LLM")
+            trimmed_context = _normalize_text_fast(brand_context)[:_MAX_BRAND_CONTEXT_CHARS]
             prompt = f"""
             Please analyze and enhance the following brand context text. Make it more concise, 
             professional, and informative. Extract the key value propositions and brand story.
             Keep it under 300 words.
             
-            Original text: {brand_context}
+            Original text: {trimmed_context}
             """
             
-            response = await self.client.ainvoke([
-                ("system", "You are a brand analysis expert. Help structure and enhance brand information."),
-                ("user", prompt)
-            ])
-            
-            return response.content.strip()
+            # Near-duplicate copy is only reused for the same store; brand copy
+            # from another store would be wrong however similar it looks
+            return await _BRAND_CONTEXT_CACHE.get_or_call(prompt, lambda: self._invoke(
+                "You are a brand analysis expert. Help structure and enhance brand information.",
+                prompt
+            ), parse=_parse_brand_context, similar_text=trimmed_context, scope=store_url)
             
         except Exception as e:
             logger.error(f"Error enhancing brand context: {e}")
             return brand_context
     
-    async def _enhance_faqs(self, faqs: list) -> list:
+    async def _enhance_faqs(self, faqs: list, store_url: Optional[str] = None) -> list:
         """Clean and enhance FAQ content using LLM."""
         try:
             logger.info("Enhancing FAQs using LLM")
             if not faqs:
                 return faqs
             
-            faqs_text = "\n\n".join([f"Q: {faq.question}\nA: {faq.answer}" for faq in faqs])
+            # Drop repeated questions and keep the most detailed answers
+            seen = set()
+            unique_faqs = [faq for faq in faqs if not (faq.question in seen or seen.add(faq.question))]
+            unique_faqs = sorted(unique_faqs, key=lambda faq: len(faq.answer), reverse=True)[:_MAX_FAQS]
+            
+            faqs_text = "\n\n".join([f"Q: {faq.question}\nA: {faq.answer}" for faq in unique_faqs])
             
             prompt = f"""
             Please clean up and enhance the following FAQ content. Make questions clearer 
@@ -91,17 +277,18 @@ class LLMProcessorService:
             Return as JSON array with objects containing 'question' and 'answer' fields.
             """
             
-            response = await self.client.ainvoke([
-                ("system", "You are a customer service expert. Help improve FAQ content."),
-                ("user", prompt)
-            ])
+            # Roughly 4 characters per token, with headroom for the JSON structure
+            faq_chars = sum(len(faq.question) + len(faq.answer) for faq in unique_faqs)
+            max_output_tokens = max(64, min(_MAX_REPLY_TOKENS, int(1.2 * faq_chars / 4)))
             
-            try:
-                enhanced_faqs = json.loads(response.content)
-                from main import FAQ
-                return [FAQ(question=faq['question'], answer=faq['answer']) for faq in enhanced_faqs]
-            except json.JSONDecodeError:
-                return faqs
+            # Answers carry store-specific return windows and contact details,
+            # so similar FAQs are only reused for the same store
+            return await _FAQ_CACHE.get_or_call(prompt, lambda: self._invoke(
+                "You are a customer service expert. Help improve FAQ content.",
+                prompt,
+                max_output_tokens=max_output_tokens,
+                response_schema=_FAQ_LIST_SCHEMA
+            ), parse=_parse_faqs, similar_text=faqs_text, scope=store_url)
                 
         except Exception as e:
             logger.error(f"Error enhancing FAQs: {e}")
@@ -114,36 +301,30 @@ class LLMProcessorService:
             if not products:
                 return {}
             
-            # Sample first 20 products for analysis
-            sample_products = products[:20]
-            product_info = "\n".join([
-                f"- {p.title} by {p.vendor} (${p.price})" 
-                for p in sample_products if p.title and p.vendor
-            ])
+            # Payment methods and currencies follow from vendors and categories, not
+            # individual titles, so an aggregate summary is enough context
+            catalog_summary = _summarize_catalog(products)
             
             prompt = f"""
-            Analyze the following product catalog and extract insights:
+            Analyze the following product catalog summary and extract insights:
             
-            Products:
-            {product_info}
+            {catalog_summary}
             
             Please identify:
             1. Likely payment methods this store would accept
             2. Currencies that might be accepted
-            3. Target market demographics
             
-            Return as JSON with keys: payment_methods (array), currencies (array), target_demographics (string)
+            Return as JSON with keys: payment_methods (array), currencies (array)
             """
             
-            response = await self.client.ainvoke([
-                ("system", "You are an e-commerce analyst. Provide insights based on product catalogs."),
-                ("user", prompt)
-            ])
-            
-            try:
-                return json.loads(response.content)
-            except json.JSONDecodeError:
-                return {}
+            # Keyed on the full prompt, so only an identical summary (vendor and
+            # type tallies plus price range) reuses an answer
+            return await _CATALOG_CACHE.get_or_call(prompt, lambda: self._invoke(
+                "You are an e-commerce analyst. Provide insights based on product catalogs.",
+                prompt,
+                max_output_tokens=120,
+                response_schema=_CATALOG_SCHEMA
+            ), parse=_parse_catalog_analysis)
                 
         except Exception as e:
             logger.error(f"Error analyzing product catalog: {e}")
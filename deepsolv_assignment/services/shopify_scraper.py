@@ -1,22 +1,198 @@
 import asyncio
+from contextlib import asynccontextmanager
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 import aiohttp
-import requests
 from bs4 import BeautifulSoup
-from typing import List, Optional, Dict, Any
+from selectolax.lexbor import LexborHTMLParser
+from typing import List, Optional, Dict, Any, Tuple
 import re
+import sys
 import json
+import orjson
 from urllib.parse import urljoin, urlparse
 import logging
+from io import BytesIO
+from lxml import etree
+from pydantic import TypeAdapter, ValidationError
 from pydantic_models import BrandInsights, ProductInfo, SocialHandle, ContactInfo, FAQ, ImportantLink
 
 logger = logging.getLogger(__name__)
 
+# lxml builds the tree in C
+_PARSER = 'lxml'
+
+# Patterns used on every scrape, compiled once at import
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+_PHONE_RE = re.compile(r'[\+]?[1-9]?[\d\s\-\(\)]{10,}')
+_ADDR_RE = re.compile(r'\d+\s+[\w\s,]+\s+\d{5}')
+_WHITESPACE_RE = re.compile(r'\s+')
+_PRICE_CLS_RE = re.compile(r'price', re.I)
+_FAQ_CLS_RE = re.compile(r'faq|question', re.I)
+_FAQ_QUESTION_CLS_RE = re.compile(r'question|title', re.I)
+_FAQ_ANSWER_CLS_RE = re.compile(r'answer|content', re.I)
+_DOMAIN_TO_PLATFORM = {
+    'instagram.com': 'instagram',
+    'instagr.am': 'instagram',
+    'facebook.com': 'facebook',
+    'fb.com': 'facebook',
+    'twitter.com': 'twitter',
+    'x.com': 'twitter',
+    'tiktok.com': 'tiktok',
+    'youtube.com': 'youtube',
+    'youtu.be': 'youtube',
+    'linkedin.com': 'linkedin',
+    'pinterest.com': 'pinterest'
+}
+# Anchored to the end of the link's host, so only the domain or its subdomains match
+_SOCIAL_DOMAIN_RE = re.compile(r'(?:^|\.)(' + '|'.join(re.escape(domain) for domain in _DOMAIN_TO_PLATFORM) + r')$')
+_IMPORTANT_KW_RE = re.compile(r'track|order|blog|news|contact|support|help|shipping|size-guide|careers|about', re.I)
+_SOCIAL_HANDLE_RES = {
+    'instagram': re.compile(r'instagram\.com/([^/?]+)'),
+    'twitter': re.compile(r'(?:twitter\.com|x\.com)/([^/?]+)'),
+    'facebook': re.compile(r'facebook\.com/([^/?]+)'),
+    'tiktok': re.compile(r'tiktok\.com/@([^/?]+)'),
+    'youtube': re.compile(r'youtube\.com/(?:c/|channel/|user/)?([^/?]+)')
+}
+
+# Namespaced sitemap tags, built once
+_SITEMAP_NS = '{http://www.sitemaps.org/schemas/sitemap/0.9}'
+_SITEMAP_URL_TAG = _SITEMAP_NS + 'url'
+_SITEMAP_LOC_TAG = _SITEMAP_NS + 'loc'
+
+# Catalog entries kept from /products.json
+_MAX_PRODUCTS = 500
+
+# Contact details kept from a contact page
+_MAX_CONTACT_EMAILS = 20
+_MAX_CONTACT_PHONES = 10
+
+# Concurrent product-page fetches allowed per host
+_PER_HOST_CONCURRENCY = 8
+
+# Validates a whole catalog in a single pydantic-core call
+_PRODUCT_LIST_ADAPTER = TypeAdapter(List[ProductInfo])
+
+# Responses and transport failures worth retrying, and how long to keep trying
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_RETRY_ERRORS = (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError)
+_MAX_ATTEMPTS = 4
+_MAX_RETRY_DELAY = 10
+
+# Page parsing is CPU-bound; it runs on these threads so the event loop keeps
+# reading other responses meanwhile
+_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+
+def _social_platform(href: str) -> Optional[str]:
+    """Platform whose domain hosts the link, or None for non-social and relative links."""
+    try:
+        host = urlparse(href).hostname
+    except ValueError:
+        return None
+    match = _SOCIAL_DOMAIN_RE.search(host) if host else None
+    return _DOMAIN_TO_PLATFORM[match.group(1)] if match else None
+
+def _product_id(product_url: str) -> int:
+    """Stable 64-bit id for a product scraped from its page, identical across runs."""
+    return int.from_bytes(hashlib.blake2b(product_url.encode(), digest_size=8).digest(), 'big')
+
+_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
 class ShopifyScraperService:
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        self._session: Optional[aiohttp.ClientSession] = None
+        # host -> (semaphore, fetches holding or waiting for it)
+        self._host_semaphores: Dict[str, Tuple[asyncio.Semaphore, int]] = {}
+    
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        """Create the shared HTTP session on first use, inside the running event loop."""
+        if self._session is None or self._session.closed:
+            # Idle connections stay open long enough to be reused by the next
+            # analysis of the same store, skipping a fresh TLS handshake
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100, limit_per_host=8, keepalive_timeout=75, ttl_dns_cache=300, enable_cleanup_closed=True
+                ),
+                headers={'User-Agent': _USER_AGENT},
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self._session
+    
+    async def _get(self, url: str, timeout: int = 30) -> Tuple[int, bytes]:
+        """GET a URL and return its status code and body.
+        
+        Connection errors, timeouts, rate-limited and server-error responses are
+        retried with exponential backoff, waiting for the server's Retry-After
+        when it sends one. `timeout` bounds all attempts and waits together; once
+        another attempt would not fit, the last response is returned or the last
+        error raised.
+        """
+        session = await self._ensure_session()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        for attempt in range(_MAX_ATTEMPTS):
+            is_last = attempt == _MAX_ATTEMPTS - 1
+            try:
+                async with session.get(url, timeout=aiohttp.ClientTimeout(total=deadline - loop.time())) as response:
+                    delay = self._retry_delay(response.headers, attempt)
+                    if response.status not in _RETRY_STATUSES or is_last or loop.time() + delay >= deadline:
+                        return response.status, await response.read()
+                    reason = f"HTTP {response.status}"
+            except _RETRY_ERRORS as e:
+                delay = self._retry_delay({}, attempt)
+                if is_last or loop.time() + delay >= deadline:
+                    raise
+                reason = type(e).__name__
+            
+            logger.warning(f"{reason} fetching {url}, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+    
+    def _retry_delay(self, headers, attempt: int) -> float:
+        """Seconds to wait before retrying: Retry-After if given in seconds, else exponential backoff."""
+        try:
+            delay = float(headers['Retry-After'])
+        except (KeyError, ValueError):
+            delay = 2 ** attempt
+        return min(max(delay, 0), _MAX_RETRY_DELAY)
+    
+    async def _cached_get(self, fetch_cache: Dict[str, asyncio.Task], url: str, timeout: int = 20,
+                          raise_for_status: bool = False) -> Tuple[int, bytes]:
+        """GET a URL at most once per analysis; callers asking for the same URL share one request."""
+        if url not in fetch_cache:
+            fetch_cache[url] = asyncio.ensure_future(self._get(url, timeout=timeout))
+        status, body = await fetch_cache[url]
+        if raise_for_status and status >= 400:
+            raise ValueError(f"HTTP {status} fetching {url}")
+        return status, body
+    
+    async def _parse(self, parse_fn, *args):
+        """Run a synchronous page parser on the parse thread pool."""
+        return await asyncio.get_running_loop().run_in_executor(_EXECUTOR, parse_fn, *args)
+    
+    @asynccontextmanager
+    async def _host_semaphore(self, url: str):
+        """Bound concurrent product-page fetches against one host.
+        
+        A host's semaphore is dropped once no fetch holds or waits for it, so
+        the shared service doesn't keep one for every store it has ever scraped.
+        """
+        host = urlparse(url).netloc
+        semaphore, users = self._host_semaphores.get(host) or (asyncio.Semaphore(_PER_HOST_CONCURRENCY), 0)
+        self._host_semaphores[host] = (semaphore, users + 1)
+        try:
+            async with semaphore:
+                yield
+        finally:
+            semaphore, users = self._host_semaphores[host]
+            if users == 1:
+                del self._host_semaphores[host]
+            else:
+                self._host_semaphores[host] = (semaphore, users - 1)
+    
+    async def close(self):
+        """Release the pooled HTTP connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
     
     async def analyze_store(self, store_url: str, llm_service=None) -> BrandInsights:
         """Main method to analyze a Shopify store."""
@@ -27,24 +203,28 @@ class ShopifyScraperService:
             
             insights = BrandInsights(store_url=store_url)
             
+            # Every page fetched during this analysis, shared between scrapers so
+            # a URL reached from several places (a product linked from the homepage
+            # and listed in the sitemap, a repeated hero link) is requested once
+            fetch_cache: Dict[str, asyncio.Task] = {}
+            
             # Parallel execution of different scraping tasks
             tasks = [
-                self._scrape_products(store_url),
-                self._scrape_homepage(store_url),
-                self._scrape_policies(store_url),
-                self._scrape_contact_info(store_url),
-                self._scrape_social_handles(store_url),
-                self._scrape_faqs(store_url),
-                self._scrape_important_links(store_url)
+                self._scrape_products(store_url, fetch_cache),
+                self._scrape_storefront(store_url, fetch_cache),
+                self._scrape_policies(store_url, fetch_cache),
+                self._scrape_contact_info(store_url, fetch_cache),
+                self._scrape_faqs(store_url, fetch_cache)
             ]
             
             results = await asyncio.gather(*tasks, return_exceptions=True)
             
             # Process results
-            products, homepage_data, policies, contact_info, social_handles, faqs, important_links = results
+            products, storefront, policies, contact_info, faqs = results
+            homepage_data, social_handles, important_links = storefront if isinstance(storefront, tuple) else ({}, [], [])
             
             if isinstance(products, list):
-                insights.product_catalog = products[:500]  # Limit to 500 products
+                insights.product_catalog = products
                 insights.total_products = len(products)
             
             if isinstance(homepage_data, dict):
@@ -78,75 +258,94 @@ class ShopifyScraperService:
             logger.error(f"Error analyzing store {store_url}: {str(e)}")
             raise
     
-    async def _scrape_products(self, store_url: str) -> List[ProductInfo]:
+    async def _scrape_products(self, store_url: str, fetch_cache: Dict[str, asyncio.Task]) -> List[ProductInfo]:
         """Scrape products from /products.json endpoint."""
         try:
             products_url = urljoin(store_url, '/products.json')
-            response = self.session.get(products_url, timeout=30)
+            status, body = await self._cached_get(fetch_cache, products_url, timeout=30)
             
-            if response.status_code == 404:
+            if status == 404:
                 # Try alternative product discovery methods
-                return await self._scrape_products_from_sitemap(store_url)
-            
-            response.raise_for_status()
-            data = response.json()
-            
-            products = []
-            for product_data in data.get('products', []):
+                return await self._scrape_products_from_sitemap(store_url, fetch_cache)
+            
+            if status >= 400:
+                raise ValueError(f"HTTP {status} fetching {products_url}")
+            data = orjson.loads(body)
+            
+            # Vendors and product types repeat across a catalog; interning them
+            # lets every product share one string object per distinct value
+            raw_products = []
+            for i, product_data in enumerate(data.get('products', ())):
+                if i >= _MAX_PRODUCTS:
+                    break
                 try:
-                    product = ProductInfo(
-                        id=product_data.get('id', 0),
-                        title=product_data.get('title', ''),
-                        handle=product_data.get('handle', ''),
-                        vendor=product_data.get('vendor', ''),
-                        product_type=product_data.get('product_type', ''),
-                        price=self._extract_price(product_data),
-                        available=product_data.get('available', False),
-                        tags=product_data.get('tags', []),
-                        images=self._extract_images(product_data),
-                        description=product_data.get('body_html', ''),
-                        variants=product_data.get('variants', [])
-                    )
-                    products.append(product)
+                    raw_products.append({
+                        'id': product_data.get('id', 0),
+                        'title': product_data.get('title', ''),
+                        'handle': product_data.get('handle', ''),
+                        'vendor': sys.intern(product_data.get('vendor') or ''),
+                        'product_type': sys.intern(product_data.get('product_type') or ''),
+                        'price': self._extract_price(product_data),
+                        'available': product_data.get('available', False),
+                        'tags': product_data.get('tags', []),
+                        'images': self._extract_images(product_data),
+                        'description': product_data.get('body_html', ''),
+                        'variants': product_data.get('variants', [])
+                    })
                 except Exception as e:
                     logger.warning(f"Error processing product: {e}")
                     continue
             
-            return products
+            try:
+                return _PRODUCT_LIST_ADAPTER.validate_python(raw_products)
+            except ValidationError:
+                # Fall back to per-product validation so one bad entry doesn't drop the catalog
+                products = []
+                for fields in raw_products:
+                    try:
+                        products.append(ProductInfo(**fields))
+                    except ValidationError as e:
+                        logger.warning(f"Error processing product: {e}")
+                return products
             
         except Exception as e:
             logger.error(f"Error scraping products: {e}")
             return []
     
-    async def _scrape_products_from_sitemap(self, store_url: str) -> List[ProductInfo]:
+    async def _scrape_products_from_sitemap(self, store_url: str, fetch_cache: Dict[str, asyncio.Task]) -> List[ProductInfo]:
         """Alternative method to discover products from sitemap."""
         try:
             sitemap_url = urljoin(store_url, '/sitemap_products_1.xml')
-            response = self.session.get(sitemap_url, timeout=30)
+            status, body = await self._cached_get(fetch_cache, sitemap_url, timeout=30)
             
-            if response.status_code != 200:
+            if status != 200:
                 return []
             
-            # Parse XML and extract product URLs
-            from xml.etree import ElementTree as ET
-            root = ET.fromstring(response.content)
+            # Stream the XML and stop at the first 50 product URLs, clearing each
+            # entry once read so large sitemaps never build a full tree
+            urls = []
+            # The sitemap comes from the store being scraped, so never resolve its
+            # entities or let the parser fetch anything
+            sitemap_events = etree.iterparse(
+                BytesIO(body), tag=_SITEMAP_URL_TAG, resolve_entities=False, no_network=True, huge_tree=False
+            )
+            for _, url_elem in sitemap_events:
+                loc_elem = url_elem.find(_SITEMAP_LOC_TAG)
+                if loc_elem is not None and loc_elem.text and '/products/' in loc_elem.text:
+                    urls.append(loc_elem.text)
+                url_elem.clear()
+                if len(urls) >= 50:
+                    break
             
-            product_urls = []
-            for url_elem in root.findall('.//{http://www.sitemaps.org/schemas/sitemap/0.9}url'):
-                loc_elem = url_elem.find('{http://www.sitemaps.org/schemas/sitemap/0.9}loc')
-                if loc_elem is not None and '/products/' in loc_elem.text:
-                    product_urls.append(loc_elem.text)
+            # Scrape individual products concurrently (limit to first 50 for performance)
+            results = await asyncio.gather(*(self._scrape_individual_product(url, fetch_cache) for url in urls), return_exceptions=True)
             
-            # Scrape individual products (limit to first 50 for performance)
             products = []
-            for url in product_urls[:50]:
-                try:
-                    product = await self._scrape_individual_product(url)
-                    if product:
-                        products.append(product)
-                except Exception as e:
-                    logger.warning(f"Error scraping individual product {url}: {e}")
-                    continue
+            for url, result in zip(urls, results):
+                if isinstance(result, Exception):
+                    logger.warning(f"Error scraping individual product {url}: {result}")
+                elif result:
+                    products.append(result)
             
             return products
             
@@ -154,108 +353,132 @@ class ShopifyScraperService:
             logger.error(f"Error scraping products from sitemap: {e}")
             return []
     
-    async def _scrape_individual_product(self, product_url: str) -> Optional[ProductInfo]:
+    async def _scrape_individual_product(self, product_url: str, fetch_cache: Dict[str, asyncio.Task]) -> Optional[ProductInfo]:
         """Scrape individual product page."""
         try:
-            response = self.session.get(product_url, timeout=20)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
+            async with self._host_semaphore(product_url):
+                _, body = await self._cached_get(fetch_cache, product_url, raise_for_status=True)
             
-            # Extract product data from JSON-LD or meta tags
-            json_ld = soup.find('script', type='application/ld+json')
-            if json_ld:
-                try:
-                    data = json.loads(json_ld.string)
-                    if isinstance(data, list):
-                        data = data[0]
-                    
-                    if data.get('@type') == 'Product':
-                        return ProductInfo(
-                            id=hash(product_url),
-                            title=data.get('name', ''),
-                            handle=product_url.split('/')[-1],
-                            vendor=data.get('brand', {}).get('name', '') if isinstance(data.get('brand'), dict) else str(data.get('brand', '')),
-                            product_type='',
-                            price=str(data.get('offers', {}).get('price', '')) if data.get('offers') else '',
-                            available=data.get('offers', {}).get('availability') == 'InStock' if data.get('offers') else False,
-                            tags=[],
-                            images=[data.get('image', '')] if data.get('image') else [],
-                            description=data.get('description', '')
-                        )
-                except json.JSONDecodeError:
-                    pass
-            
-            # Fallback to HTML parsing
-            title_elem = soup.find('h1') or soup.find('title')
-            title = title_elem.get_text().strip() if title_elem else ''
-            
-            price_elem = soup.find(class_=re.compile(r'price', re.I))
-            price = price_elem.get_text().strip() if price_elem else ''
-            
-            return ProductInfo(
-                id=hash(product_url),
-                title=title,
-                handle=product_url.split('/')[-1],
-                vendor='',
-                product_type='',
-                price=price,
-                available=True,
-                tags=[],
-                images=[],
-                description=''
-            )
+            return await self._parse(self._parse_product_page, product_url, body)
             
         except Exception as e:
             logger.error(f"Error scraping individual product {product_url}: {e}")
             return None
     
-    async def _scrape_homepage(self, store_url: str) -> Dict[str, Any]:
-        """Scrape homepage for hero products and brand context."""
+    def _parse_product_page(self, product_url: str, body: bytes) -> ProductInfo:
+        """Extract product data from a product page."""
+        soup = BeautifulSoup(body, _PARSER)
+        
+        # Extract product data from JSON-LD or meta tags
+        json_ld = soup.find('script', type='application/ld+json')
+        if json_ld:
+            try:
+                data = json.loads(json_ld.string)
+                if isinstance(data, list):
+                    data = data[0]
+                
+                if data.get('@type') == 'Product':
+                    return ProductInfo(
+                        id=_product_id(product_url),
+                        title=data.get('name', ''),
+                        handle=product_url.split('/')[-1],
+                        vendor=data.get('brand', {}).get('name', '') if isinstance(data.get('brand'), dict) else str(data.get('brand', '')),
+                        product_type='',
+                        price=str(data.get('offers', {}).get('price', '')) if data.get('offers') else '',
+                        available=data.get('offers', {}).get('availability') == 'InStock' if data.get('offers') else False,
+                        tags=[],
+                        images=[data.get('image', '')] if data.get('image') else [],
+                        description=data.get('description', '')
+                    )
+            except json.JSONDecodeError:
+                pass
+        
+        # Fallback to HTML parsing
+        title_elem = soup.find('h1') or soup.find('title')
+        title = title_elem.get_text().strip() if title_elem else ''
+        
+        price_elem = soup.find(class_=_PRICE_CLS_RE)
+        price = price_elem.get_text().strip() if price_elem else ''
+        
+        return ProductInfo(
+            id=_product_id(product_url),
+            title=title,
+            handle=product_url.split('/')[-1],
+            vendor='',
+            product_type='',
+            price=price,
+            available=True,
+            tags=[],
+            images=[],
+            description=''
+        )
+    
+    async def _scrape_storefront(self, store_url: str, fetch_cache: Dict[str, asyncio.Task]) -> Tuple[Dict[str, Any], List[SocialHandle], List[ImportantLink]]:
+        """Fetch and parse the homepage once, then extract homepage data, social handles and important links."""
+        try:
+            _, body = await self._cached_get(fetch_cache, store_url, timeout=30, raise_for_status=True)
+            homepage_data, social_handles, important_links = await self._parse(self._parse_storefront, store_url, body)
+        except Exception as e:
+            logger.error(f"Error fetching homepage: {e}")
+            return {}, [], []
+        
+        hero_urls = homepage_data.pop('hero_urls', [])
+        homepage_data['hero_products'] = await self._scrape_hero_products(hero_urls, fetch_cache)
+        return homepage_data, social_handles, important_links
+    
+    def _parse_storefront(self, store_url: str, body: bytes) -> Tuple[Dict[str, Any], List[SocialHandle], List[ImportantLink]]:
+        """Parse the homepage and extract homepage data, social handles and important links."""
+        tree = LexborHTMLParser(body)
+        return self._scrape_homepage(store_url, tree), self._scrape_social_handles(tree), self._scrape_important_links(store_url, tree)
+    
+    async def _scrape_hero_products(self, hero_urls: List[str], fetch_cache: Dict[str, asyncio.Task]) -> List[ProductInfo]:
+        """Fetch the featured product pages concurrently."""
+        results = await asyncio.gather(*(self._scrape_individual_product(url, fetch_cache) for url in hero_urls), return_exceptions=True)
+        return [result for result in results if isinstance(result, ProductInfo)]
+    
+    def _scrape_homepage(self, store_url: str, tree: LexborHTMLParser) -> Dict[str, Any]:
+        """Scrape homepage for hero product links and brand context."""
         try:
-            response = self.session.get(store_url, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
             # Extract store name
-            title_elem = soup.find('title')
-            store_name = title_elem.get_text().strip() if title_elem else ''
+            title_elem = tree.css_first('title')
+            store_name = title_elem.text().strip() if title_elem else ''
             
             # Extract brand context from about section or meta description
             brand_context = ''
-            meta_desc = soup.find('meta', attrs={'name': 'description'})
+            meta_desc = tree.css_first('meta[name="description"]')
             if meta_desc:
-                brand_context = meta_desc.get('content', '')
+                brand_context = meta_desc.attributes.get('content') or ''
             
             # Look for about section
-            about_section = soup.find(text=re.compile(r'about', re.I))
-            if about_section and about_section.parent:
-                brand_context = about_section.parent.get_text().strip()[:500]
+            about_elem = tree.css_first('[id*="about" i], [class*="about" i]')
+            about_text = ''
+            if about_elem:
+                # Lexbor's text() includes script and style content
+                for hidden in about_elem.css('script, style, template'):
+                    hidden.decompose()
+                about_text = about_elem.text(separator=' ', strip=True)
+            if about_text:
+                brand_context = about_text[:500]
             
             # Extract hero products (featured products on homepage)
-            hero_products = []
-            product_links = soup.find_all('a', href=re.compile(r'/products/'))
-            
-            for link in product_links[:10]:  # Limit to first 10
-                href = link.get('href')
-                if href:
-                    full_url = urljoin(store_url, href)
-                    product = await self._scrape_individual_product(full_url)
-                    if product:
-                        hero_products.append(product)
+            product_links = tree.css('a[href*="/products/"]')
+            hero_urls = [
+                urljoin(store_url, link.attributes['href'])
+                for link in product_links[:10]  # Limit to first 10
+                if link.attributes.get('href')
+            ]
             
             return {
                 'store_name': store_name,
                 'brand_context': brand_context,
-                'hero_products': hero_products
+                'hero_urls': hero_urls
             }
             
         except Exception as e:
             logger.error(f"Error scraping homepage: {e}")
             return {}
     
-    async def _scrape_policies(self, store_url: str) -> Dict[str, str]:
+    async def _scrape_policies(self, store_url: str, fetch_cache: Dict[str, asyncio.Task]) -> Dict[str, str]:
         """Scrape privacy policy and return/refund policy."""
         policies = {}
         
@@ -268,18 +491,10 @@ class ShopifyScraperService:
             for url_path in urls:
                 try:
                     full_url = urljoin(store_url, url_path)
-                    response = self.session.get(full_url, timeout=20)
+                    status, body = await self._cached_get(fetch_cache, full_url)
                     
-                    if response.status_code == 200:
-                        soup = BeautifulSoup(response.content, 'html.parser')
-                        
-                        # Remove script and style elements
-                        for script in soup(["script", "style"]):
-                            script.decompose()
-                        
-                        content = soup.get_text()
-                        # Clean up whitespace
-                        content = re.sub(r'\s+', ' ', content).strip()
+                    if status == 200:
+                        content = await self._parse(self._parse_policy_page, body)
                         
                         if len(content) > 100:  # Ensure it's substantial content
                             policies[policy_type] = content[:2000]  # Limit length
@@ -291,7 +506,30 @@ class ShopifyScraperService:
         
         return policies
     
-    async def _scrape_contact_info(self, store_url: str) -> ContactInfo:
+    def _parse_policy_page(self, body: bytes) -> str:
+        """Extract the leading whitespace-collapsed text of a policy page."""
+        tree = etree.HTML(body)
+        if tree is None:
+            return ''
+        
+        # Remove script and style elements, keeping the text that follows them
+        etree.strip_elements(tree, 'script', 'style', with_tail=False)
+        
+        # Only the first 2000 characters are kept, so stop collecting
+        # text once there is enough to fill them after whitespace collapse;
+        # indentation-only nodes don't count towards the budget
+        text_parts = []
+        total = 0
+        for text in tree.itertext():
+            text_parts.append(text)
+            total += len(text.strip())
+            if total > 3000:
+                break
+        
+        # Clean up whitespace
+        return _WHITESPACE_RE.sub(' ', ''.join(text_parts)).strip()
+    
+    async def _scrape_contact_info(self, store_url: str, fetch_cache: Dict[str, asyncio.Task]) -> ContactInfo:
         """Scrape contact information."""
         try:
             # Try contact page first
@@ -302,25 +540,14 @@ class ShopifyScraperService:
             for contact_path in contact_urls:
                 try:
                     contact_url = urljoin(store_url, contact_path)
-                    response = self.session.get(contact_url, timeout=20)
+                    status, body = await self._cached_get(fetch_cache, contact_url)
                     
-                    if response.status_code == 200:
-                        soup = BeautifulSoup(response.content, 'html.parser')
-                        text = soup.get_text()
-                        
-                        # Extract emails
-                        emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
+                    if status == 200:
+                        emails, phones, address = await self._parse(self._parse_contact_page, body)
                         contact_info.emails.extend(emails)
-                        
-                        # Extract phone numbers
-                        phones = re.findall(r'[\+]?[1-9]?[\d\s\-\(\)]{10,}', text)
-                        contact_info.phones.extend([phone.strip() for phone in phones if len(re.sub(r'[^\d]', '', phone)) >= 10])
-                        
-                        # Extract address (basic approach)
-                        address_pattern = r'\d+\s+[\w\s,]+\s+\d{5}'
-                        addresses = re.findall(address_pattern, text)
-                        if addresses:
-                            contact_info.address = addresses[0]
+                        contact_info.phones.extend(phones)
+                        if address:
+                            contact_info.address = address
                         
                         break
                         
@@ -338,57 +565,77 @@ class ShopifyScraperService:
             logger.error(f"Error scraping contact info: {e}")
             return ContactInfo()
     
-    async def _scrape_social_handles(self, store_url: str) -> List[SocialHandle]:
-        """Scrape social media handles."""
+    def _parse_contact_page(self, body: bytes) -> Tuple[List[str], List[str], Optional[str]]:
+        """Extract emails, phone numbers and an address from a contact page."""
+        # Dicts keep first-seen order while dropping repeats, so a footer
+        # email repeated on every line counts once towards the caps
+        emails = {}
+        phones = {}
+        address = None
+        
+        tree = etree.HTML(body)
+        if tree is None:
+            return [], [], address
+        
+        # Remove non-visible text; inline scripts carry long ids that look like phone numbers
+        etree.strip_elements(tree, 'script', 'style', 'template', with_tail=False)
+        
+        # Match text nodes one at a time and stop once enough has been found,
+        # rather than joining the whole page into one string
+        for text in tree.itertext():
+            # Extract emails
+            if len(emails) < _MAX_CONTACT_EMAILS:
+                emails.update(dict.fromkeys(m.group(0) for m in _EMAIL_RE.finditer(text)))
+            
+            # Extract phone numbers
+            if len(phones) < _MAX_CONTACT_PHONES:
+                phones.update(dict.fromkeys(
+                    m.group(0).strip() for m in _PHONE_RE.finditer(text)
+                    if sum(c.isdigit() for c in m.group(0)) >= 10
+                ))
+            
+            # Extract address (basic approach)
+            if address is None:
+                match = _ADDR_RE.search(text)
+                if match:
+                    address = match.group(0)
+            
+            if len(emails) >= _MAX_CONTACT_EMAILS and len(phones) >= _MAX_CONTACT_PHONES and address is not None:
+                break
+        
+        return list(emails)[:_MAX_CONTACT_EMAILS], list(phones)[:_MAX_CONTACT_PHONES], address
+    
+    def _scrape_social_handles(self, tree: LexborHTMLParser) -> List[SocialHandle]:
+        """Scrape social media handles from the parsed homepage."""
         try:
-            response = self.session.get(store_url, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
             social_handles = []
-            social_platforms = {
-                'instagram': ['instagram.com', 'instagr.am'],
-                'facebook': ['facebook.com', 'fb.com'],
-                'twitter': ['twitter.com', 'x.com'],
-                'tiktok': ['tiktok.com'],
-                'youtube': ['youtube.com', 'youtu.be'],
-                'linkedin': ['linkedin.com'],
-                'pinterest': ['pinterest.com']
-            }
+            seen_platforms = set()
             
-            # Find all links
-            links = soup.find_all('a', href=True)
+            # Find all links; keep the first link seen for each platform
+            links = tree.css('a[href]')
             
             for link in links:
-                href = link.get('href', '')
-                for platform, domains in social_platforms.items():
-                    for domain in domains:
-                        if domain in href:
-                            # Extract handle from URL
-                            handle = self._extract_social_handle(href, platform)
-                            social_handles.append(SocialHandle(
-                                platform=platform,
-                                url=href,
-                                handle=handle
-                            ))
-                            break
-            
-            # Remove duplicates based on platform
-            seen_platforms = set()
-            unique_handles = []
-            for handle in social_handles:
-                if handle.platform not in seen_platforms:
-                    unique_handles.append(handle)
-                    seen_platforms.add(handle.platform)
+                href = link.attributes.get('href') or ''
+                platform = _social_platform(href)
+                if not platform or platform in seen_platforms:
+                    continue
+                seen_platforms.add(platform)
+                
+                # Extract handle from URL
+                handle = self._extract_social_handle(href, platform)
+                social_handles.append(SocialHandle(
+                    platform=platform,
+                    url=href,
+                    handle=handle
+                ))
             
-            return unique_handles
+            return social_handles
             
         except Exception as e:
             logger.error(f"Error scraping social handles: {e}")
             return []
     
-    async def _scrape_faqs(self, store_url: str) -> List[FAQ]:
+    async def _scrape_faqs(self, store_url: str, fetch_cache: Dict[str, asyncio.Task]) -> List[FAQ]:
         """Scrape FAQ section."""
         try:
             faq_urls = ['/pages/faq', '/faq', '/pages/frequently-asked-questions', '/help']
@@ -396,39 +643,10 @@ class ShopifyScraperService:
             for faq_path in faq_urls:
                 try:
                     faq_url = urljoin(store_url, faq_path)
-                    response = self.session.get(faq_url, timeout=20)
+                    status, body = await self._cached_get(fetch_cache, faq_url)
                     
-                    if response.status_code == 200:
-                        soup = BeautifulSoup(response.content, 'html.parser')
-                        
-                        faqs = []
-                        
-                        # Method 1: Look for structured FAQ elements
-                        faq_items = soup.find_all(class_=re.compile(r'faq|question', re.I))
-                        
-                        for item in faq_items:
-                            question_elem = item.find(class_=re.compile(r'question|title', re.I))
-                            answer_elem = item.find(class_=re.compile(r'answer|content', re.I))
-                            
-                            if question_elem and answer_elem:
-                                question = question_elem.get_text().strip()
-                                answer = answer_elem.get_text().strip()
-                                
-                                if question and answer and len(question) > 10:
-                                    faqs.append(FAQ(question=question, answer=answer[:500]))
-                        
-                        # Method 2: Look for h3/h4 followed by p tags
-                        if not faqs:
-                            headings = soup.find_all(['h3', 'h4', 'h5'])
-                            for heading in headings:
-                                question = heading.get_text().strip()
-                                if '?' in question:
-                                    # Look for the next sibling that contains text
-                                    answer_elem = heading.find_next_sibling(['p', 'div'])
-                                    if answer_elem:
-                                        answer = answer_elem.get_text().strip()
-                                        if answer and len(answer) > 20:
-                                            faqs.append(FAQ(question=question, answer=answer[:500]))
+                    if status == 200:
+                        faqs = await self._parse(self._parse_faq_page, body)
                         
                         if faqs:
                             return faqs[:20]  # Limit to 20 FAQs
@@ -443,39 +661,66 @@ class ShopifyScraperService:
             logger.error(f"Error scraping FAQs: {e}")
             return []
     
-    async def _scrape_important_links(self, store_url: str) -> List[ImportantLink]:
-        """Scrape important links like order tracking, blogs, etc."""
-        try:
-            response = self.session.get(store_url, timeout=30)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            important_keywords = [
-                'track', 'order', 'blog', 'news', 'contact', 'support', 
-                'help', 'shipping', 'size-guide', 'careers', 'about'
-            ]
+    def _parse_faq_page(self, body: bytes) -> List[FAQ]:
+        """Extract question/answer pairs from an FAQ page."""
+        soup = BeautifulSoup(body, _PARSER)
+        
+        faqs = []
+        
+        # Method 1: Look for structured FAQ elements
+        faq_items = soup.find_all(class_=_FAQ_CLS_RE)
+        
+        for item in faq_items:
+            question_elem = item.find(class_=_FAQ_QUESTION_CLS_RE)
+            answer_elem = item.find(class_=_FAQ_ANSWER_CLS_RE)
             
+            if question_elem and answer_elem:
+                question = question_elem.get_text().strip()
+                answer = answer_elem.get_text().strip()
+                
+                if question and answer and len(question) > 10:
+                    faqs.append(FAQ(question=question, answer=answer[:500]))
+        
+        # Method 2: Look for h3/h4 followed by p tags
+        if not faqs:
+            headings = soup.find_all(['h3', 'h4', 'h5'])
+            for heading in headings:
+                question = heading.get_text().strip()
+                if '?' in question:
+                    # Look for the next sibling that contains text
+                    answer_elem = heading.find_next_sibling(['p', 'div'])
+                    if answer_elem:
+                        answer = answer_elem.get_text().strip()
+                        if answer and len(answer) > 20:
+                            faqs.append(FAQ(question=question, answer=answer[:500]))
+        
+        return faqs
+    
+    def _scrape_important_links(self, store_url: str, tree: LexborHTMLParser) -> List[ImportantLink]:
+        """Scrape important links like order tracking, blogs, etc. from the parsed homepage."""
+        try:
             important_links = []
-            links = soup.find_all('a', href=True)
+            links = tree.css('a[href]')
             
             for link in links:
-                href = link.get('href', '')
-                text = link.get_text().strip().lower()
+                href = link.attributes.get('href') or ''
                 
                 # Skip if it's just a fragment or external link to social media
-                if href.startswith('#') or any(social in href for social in ['facebook', 'instagram', 'twitter']):
+                if href.startswith('#') or _social_platform(href):
                     continue
                 
-                for keyword in important_keywords:
-                    if keyword in text or keyword in href.lower():
-                        full_url = urljoin(store_url, href)
-                        important_links.append(ImportantLink(
-                            name=link.get_text().strip() or keyword.title(),
-                            url=full_url,
-                            description=f"Link related to {keyword}"
-                        ))
-                        break
+                link_text = link.text().strip()
+                match = _IMPORTANT_KW_RE.search(link_text) or _IMPORTANT_KW_RE.search(href)
+                if not match:
+                    continue
+                
+                keyword = match.group(0).lower()
+                full_url = urljoin(store_url, href)
+                important_links.append(ImportantLink(
+                    name=link_text or keyword.title(),
+                    url=full_url,
+                    description=f"Link related to {keyword}"
+                ))
             
             # Remove duplicates
             seen_urls = set()
@@ -507,22 +752,10 @@ class ShopifyScraperService:
     def _extract_social_handle(self, url: str, platform: str) -> str:
         """Extract social media handle from URL."""
         try:
-            if platform == 'instagram':
-                match = re.search(r'instagram\.com/([^/?]+)', url)
-                return match.group(1) if match else ''
-            elif platform == 'twitter':
-                match = re.search(r'(?:twitter\.com|x\.com)/([^/?]+)', url)
-                return match.group(1) if match else ''
-            elif platform == 'facebook':
-                match = re.search(r'facebook\.com/([^/?]+)', url)
-                return match.group(1) if match else ''
-            elif platform == 'tiktok':
-                match = re.search(r'tiktok\.com/@([^/?]+)', url)
-                return match.group(1) if match else ''
-            elif platform == 'youtube':
-                match = re.search(r'youtube\.com/(?:c/|channel/|user/)?([^/?]+)', url)
-                return match.group(1) if match else ''
-            else:
+            pattern = _SOCIAL_HANDLE_RES.get(platform)
+            if pattern is None:
                 return ''
+            match = pattern.search(url)
+            return match.group(1) if match else ''
         except Exception:
             return ''
@@ -0,0 +1,183 @@
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+from unittest import mock
+
+import orjson
+from selectolax.lexbor import LexborHTMLParser
+from sqlalchemy import create_engine, inspect, text
+
+import services.llm_cache as llm_cache
+from models import migrate_schema
+from pydantic_models import StoreAnalysisRequest
+from services.shopify_scraper import ShopifyScraperService, _social_platform
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+class StartupTest(unittest.TestCase):
+    def test_app_starts_with_default_database_url(self):
+        """The app imports and serves requests against the README's default SQLite URL."""
+        script = textwrap.dedent("""
+            from fastapi.testclient import TestClient
+            import main
+            with TestClient(main.app) as client:
+                assert client.get('/health').status_code == 200
+                response = client.get('/stores')
+                assert response.status_code == 200, response.text
+                assert response.json() == [], response.text
+        """)
+        env = {k: v for k, v in os.environ.items() if k != 'DATABASE_URL'}
+        env['PYTHONPATH'] = APP_DIR
+        with tempfile.TemporaryDirectory() as workdir:
+            result = subprocess.run([sys.executable, '-c', script], cwd=workdir, env=env,
+                                    capture_output=True, text=True, timeout=60)
+            self.assertEqual(result.returncode, 0, result.stderr)
+            self.assertTrue(os.path.exists(os.path.join(workdir, 'shopify_insights.db')))
+
+class MigrateSchemaTest(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine('sqlite://')
+        with self.engine.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE shopify_stores (id INTEGER PRIMARY KEY, store_url VARCHAR(500) NOT NULL UNIQUE, "
+                "store_name VARCHAR(200), insights_data TEXT NOT NULL, created_at DATETIME, updated_at DATETIME, "
+                "is_active BOOLEAN)"
+            ))
+            conn.execute(text(
+                "INSERT INTO shopify_stores (store_url, insights_data) VALUES "
+                "('https://old.com/', '{\"total_products\": 42}'), ('https://empty.com/', '{}')"
+            ))
+
+    def test_adds_indexes_and_backfills_total_products(self):
+        with self.engine.begin() as conn:
+            migrate_schema(conn)
+
+        inspector = inspect(self.engine)
+        self.assertIn('total_products', {c['name'] for c in inspector.get_columns('shopify_stores')})
+        self.assertIn('ix_shopify_stores_total_products', {i['name'] for i in inspector.get_indexes('shopify_stores')})
+        with self.engine.connect() as conn:
+            rows = dict(conn.execute(text("SELECT store_url, total_products FROM shopify_stores")).all())
+        self.assertEqual(rows, {'https://old.com/': 42, 'https://empty.com/': 0})
+
+    def test_is_idempotent(self):
+        with self.engine.begin() as conn:
+            migrate_schema(conn)
+        with self.engine.begin() as conn:
+            migrate_schema(conn)
+
+class SocialPlatformTest(unittest.TestCase):
+    def test_matches_social_hosts_and_subdomains(self):
+        self.assertEqual(_social_platform('https://x.com/brand'), 'twitter')
+        self.assertEqual(_social_platform('https://m.facebook.com/brand'), 'facebook')
+        self.assertEqual(_social_platform('//www.instagram.com/brand'), 'instagram')
+
+    def test_ignores_lookalike_and_relative_links(self):
+        self.assertIsNone(_social_platform('https://www.fedex.com/pages/contact'))
+        self.assertIsNone(_social_platform('https://shop.lux.com/blogs/news'))
+        self.assertIsNone(_social_platform('/pages/contact'))
+        self.assertIsNone(_social_platform('http://[bad'))
+
+class ImportantLinksTest(unittest.TestCase):
+    def test_keeps_same_store_links_on_lookalike_domains(self):
+        tree = LexborHTMLParser(
+            '<a href="https://www.fedex.com/pages/contact">Contact us</a>'
+            '<a href="https://www.fedex.com/blogs/news">Blog</a>'
+            '<a href="https://x.com/fedex">Follow</a>'
+            '<a href="/pages/size-guide"></a>'
+        )
+        links = ShopifyScraperService()._scrape_important_links('https://www.fedex.com/', tree)
+        self.assertEqual(
+            [(link.name, link.url, link.description) for link in links],
+            [
+                ('Contact us', 'https://www.fedex.com/pages/contact', 'Link related to contact'),
+                ('Blog', 'https://www.fedex.com/blogs/news', 'Link related to blog'),
+                ('Size-Guide', 'https://www.fedex.com/pages/size-guide', 'Link related to size-guide'),
+            ]
+        )
+
+class ParseContactPageTest(unittest.TestCase):
+    def parse(self, html: str):
+        return ShopifyScraperService()._parse_contact_page(html.encode())
+
+    def test_skips_script_and_style_text(self):
+        emails, phones, _ = self.parse(
+            '<script>var meta = {"product": {"id": 7234567890123, "variants": [{"id": 41234567890123}]}};</script>'
+            '<style>.x { content: "a@b.com"; }</style><p>Call 555-123-4567</p>'
+        )
+        self.assertEqual(phones, ['555-123-4567'])
+        self.assertEqual(emails, [])
+
+    def test_dedupes_before_capping(self):
+        footer = '<p>hello@store.com</p>' * 30
+        others = ''.join(f'<p>team{i}@store.com</p>' for i in range(30))
+        emails, _, _ = self.parse(footer + others)
+        self.assertEqual(len(emails), 20)
+        self.assertEqual(len(set(emails)), 20)
+        self.assertEqual(emails[:2], ['hello@store.com', 'team0@store.com'])
+
+    def test_finds_address(self):
+        _, _, address = self.parse('<p>Visit 123 Main Street, Springfield 12345</p>')
+        self.assertEqual(address, '123 Main Street, Springfield 12345')
+
+class _FixedEmbedder:
+    async def aembed_query(self, text):
+        return [1.0, 0.0]
+
+class SemanticCacheTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        patcher = mock.patch.object(llm_cache, '_get_embedder', return_value=_FixedEmbedder())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = llm_cache.SemanticCache()
+
+    async def test_invalid_reply_is_not_cached(self):
+        replies = iter(['[{"question": "q"', '["ok"]'])
+        calls = []
+
+        async def call():
+            calls.append(1)
+            return next(replies)
+
+        with self.assertRaises(ValueError):
+            await self.cache.get_or_call('prompt', call, parse=_parse_list)
+        self.assertEqual(await self.cache.get_or_call('prompt', call, parse=_parse_list), ['ok'])
+        self.assertEqual(await self.cache.get_or_call('prompt', call, parse=_parse_list), ['ok'])
+        self.assertEqual(len(calls), 2)
+
+    async def test_similar_matches_stay_within_scope(self):
+        async def reply(content):
+            return content
+
+        first = await self.cache.get_or_call('p1', lambda: reply('store one'), similar_text='t', scope='one')
+        other = await self.cache.get_or_call('p2', lambda: reply('store two'), similar_text='t', scope='two')
+        again = await self.cache.get_or_call('p3', lambda: reply('unused'), similar_text='t', scope='one')
+        self.assertEqual((first, other, again), ('store one', 'store two', 'store one'))
+
+def _parse_list(content: str) -> list:
+    try:
+        return orjson.loads(content)
+    except orjson.JSONDecodeError as e:
+        raise ValueError(str(e))
+
+class StoreAnalysisRequestTest(unittest.TestCase):
+    def test_normalizes_like_http_url(self):
+        cases = {
+            'https://A.com': 'https://a.com/',
+            'HTTPS://Shop.Example.com:443/Path?q=1': 'https://shop.example.com/Path?q=1',
+            'https://bücher.de': 'https://xn--bcher-kva.de/',
+            'https://a.com/a/./b/../c d': 'https://a.com/a/c%20d',
+            'https:\\\\a.com\\x': 'https://a.com/x',
+        }
+        for url, expected in cases.items():
+            self.assertEqual(StoreAnalysisRequest(website_url=url).website_url, expected)
+
+    def test_rejects_non_http_urls(self):
+        for url in ('ftp://a.com', 'a.com', 'https://'):
+            with self.assertRaises(ValueError):
+                StoreAnalysisRequest(website_url=url)
+
+if __name__ == "__main__":
+    unittest.main()